@@ -0,0 +1,100 @@
+import numpy as np
+import binary_diary
+from mood_rules import DEFAULT_RULES, NO_DIAGNOSIS, WINDOW
+
+# day 1 of the proleptic Gregorian calendar, as used by date.toordinal()
+_ORDINAL_EPOCH = np.datetime64("0001-01-01", "D")
+
+
+def load_scores(diary_path):
+    """
+    Load a whole diary into arrays.
+    :param diary_path: path of a 'YYYY-MM-DD: n' text diary or of a binary diary.
+    :returns: (days, scores): an int32 array of day ordinals and an int8 array of scores, in diary order.
+    """
+    if binary_diary.is_binary(diary_path):
+        records = binary_diary.as_array(binary_diary.read_buffer(diary_path))
+        return records["day"].astype(np.int32), records["score"].astype(np.int8)
+    with open(diary_path, "rb") as f:
+        lines = f.read().split(b"\n")
+    lines = np.array([line for line in lines if line.strip()])
+    if len(lines) == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int8)
+    dates = lines.astype("S10").astype("datetime64[D]")
+    days = ((dates - _ORDINAL_EPOCH).astype(np.int64) + 1).astype(np.int32)
+    scores = np.char.partition(lines, b": ")[:, 2].astype(np.int8)
+    return days, scores
+
+
+def window_sums(values, window=WINDOW):
+    """
+    :param values: an array of numbers.
+    :param window: window length.
+    :returns: the sum of every full window, by differencing the cumulative sum; len(values) - window + 1 values.
+    """
+    cumsum = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return cumsum[window:] - cumsum[:-window]
+
+
+def window_counts(scores, score, window=WINDOW):
+    """
+    :param scores: an array of scores.
+    :param score: the score to count.
+    :param window: window length.
+    :returns: how often the score occurs in every full window, as a sliding-window convolution.
+    """
+    return np.convolve((scores == score).astype(np.int32), np.ones(window, dtype=np.int32), mode="valid")
+
+
+def window_keys(scores, rules=DEFAULT_RULES):
+    """
+    :param scores: an array of scores.
+    :param rules: the compiled diagnosis rules; their window length is used.
+    :returns: the rule lookup key of every full window. A key is the sum of the strides of the window's scores,
+        so the keys are rolling sums of the scores mapped to their strides.
+    """
+    strides = np.zeros(256, dtype=np.int64)
+    for score, stride in rules.stride_of.items():
+        strides[score % 256] = stride
+    return window_sums(strides[scores.astype(np.uint8)], rules.window)
+
+
+def diagnose_all(scores, window=None, rules=DEFAULT_RULES):
+    """
+    Diagnose every position of a score series in one vectorized pass.
+    :param scores: the scores, oldest first.
+    :param window: window length, the length the rules were written for by default.
+    :param rules: the compiled diagnosis rules.
+    :returns: an int8 array of diagnosis codes (see rules.diagnoses), one per position;
+        position i is the diagnosis of the window ending at entry i, or NO_DIAGNOSIS for the first window - 1 positions.
+    """
+    if window is not None:
+        rules = rules.with_window(window)
+    scores = np.asarray(scores, dtype=np.int8)
+    codes = np.full(len(scores), NO_DIAGNOSIS, dtype=np.int8)
+    if len(scores) < rules.window:
+        return codes
+    table = np.frombuffer(rules.table, dtype=np.uint8)
+    codes[rules.window - 1 :] = table[window_keys(scores, rules)]
+    return codes
+
+
+def diagnosis_history(diary_path, window=None, rules=DEFAULT_RULES):
+    """
+    Diagnose every day of a diary as if assess_mood() had been run right after each entry.
+    :param diary_path: path of the diary.
+    :param window: window length, the length the rules were written for by default.
+    :param rules: the compiled diagnosis rules.
+    :returns: (days, codes) arrays of equal length.
+    """
+    days, scores = load_scores(diary_path)
+    return days, diagnose_all(scores, window, rules)
+
+
+def labels(codes, rules=DEFAULT_RULES):
+    """
+    :param codes: diagnosis codes.
+    :param rules: the compiled diagnosis rules the codes came from.
+    :returns: the diagnosis names, with None for NO_DIAGNOSIS.
+    """
+    return [None if code == NO_DIAGNOSIS else rules.diagnoses[code] for code in codes]
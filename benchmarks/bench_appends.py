@@ -0,0 +1,84 @@
+"""
+Measure append throughput: one locked append per entry against group commit, for each durability mode,
+and a multi-process stress run where every process races to store the same days.
+Usage: python benchmarks/bench_appends.py [number of users] [days per user] [number of processes]
+"""
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from diary_writer import GroupCommitWriter, append_once  # noqa: E402
+
+FIRST_DAY = datetime.date(2020, 1, 1)
+
+
+def make_paths(tmp, num_users):
+    paths = [os.path.join(tmp, f"user{i}.txt") for i in range(num_users)]
+    for path in paths:
+        open(path, "w").close()
+    return paths
+
+
+def per_entry(paths, num_days, durability):
+    for day in range(num_days):
+        date = FIRST_DAY + datetime.timedelta(days=day)
+        for path in paths:
+            append_once(path, date, 1, durability=durability)
+
+
+def group_commit(paths, num_days, durability):
+    with GroupCommitWriter(durability=durability) as writer:
+        for day in range(num_days):
+            date = FIRST_DAY + datetime.timedelta(days=day)
+            for path in paths:
+                writer.add(path, date, 1)
+
+
+def racer(paths, num_days):
+    # every process tries to store every day for every user; the lock must keep exactly one of each
+    for day in range(num_days):
+        date = FIRST_DAY + datetime.timedelta(days=day)
+        for path in paths:
+            append_once(path, date, 1, durability="none")
+
+
+def main():
+    num_users = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    num_days = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    num_processes = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    num_entries = num_users * num_days
+    print(f"{num_users} users x {num_days} days = {num_entries} entries")
+    for durability in ["entry", "batch", "none"]:
+        for name, func in [("per entry", per_entry), ("group commit", group_commit)]:
+            with tempfile.TemporaryDirectory() as tmp:
+                paths = make_paths(tmp, num_users)
+                start = time.perf_counter()
+                func(paths, num_days, durability)
+                elapsed = time.perf_counter() - start
+            print(f"{name:>12}, durability={durability:<5}: {num_entries / elapsed:10,.0f} entries/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_paths(tmp, num_users)
+        processes = [multiprocessing.Process(target=racer, args=(paths, num_days)) for _ in range(num_processes)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        lines = 0
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                lines += len(f.readlines())
+        attempts = num_entries * num_processes
+        print(f"stress: {num_processes} processes, {attempts / elapsed:,.0f} attempts/s, "
+              f"{lines} entries written (expected {num_entries})")
+        assert lines == num_entries
+
+
+if __name__ == "__main__":
+    main()
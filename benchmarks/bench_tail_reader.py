@@ -0,0 +1,66 @@
+"""
+Compare reading a whole diary with readlines() against seeking backwards from its end.
+Usage: python benchmarks/bench_tail_reader.py [number of lines]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from diary_reader import has_entry_for, tail_lines  # noqa: E402
+
+
+def write_diary(path, num_lines):
+    # dates repeat once the calendar runs out, which does not matter for reading speed
+    first = datetime.date(2000, 1, 1).toordinal()
+    span = datetime.date(9999, 12, 31).toordinal() - first
+    with open(path, "w", encoding="utf-8") as f:
+        chunk = []
+        for i in range(num_lines):
+            day = datetime.date.fromordinal(first + i % span)
+            chunk.append(f"{day}: {i % 5 - 2}\n")
+            if len(chunk) == 100_000:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+
+def readlines_way(path, date_text):
+    with open(path, encoding="utf-8") as f:
+        entries = f.readlines()
+    found = any(date_text in entry for entry in entries)
+    return found, entries[-7:]
+
+
+def tail_way(path, date_text):
+    return has_entry_for(path, date_text), tail_lines(path, 7)
+
+
+def best_of(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mood_diary.txt")
+        write_diary(path, num_lines)
+        date_text = "1999-01-01"  # never present, so the full scan cannot stop early
+        slow = best_of(readlines_way, path, date_text)
+        fast = best_of(tail_way, path, date_text)
+        print(f"lines: {num_lines:,} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        print(f"readlines(): {slow * 1000:10.3f} ms")
+        print(f"tail_lines(): {fast * 1000:10.3f} ms")
+        print(f"speedup: {slow / fast:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
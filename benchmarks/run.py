@@ -0,0 +1,203 @@
+"""
+Benchmark suite for the mood assessor.
+
+Generates synthetic diaries of the requested sizes, times the cold and warm paths of each stage of
+assess_mood() and the batch and streaming APIs, records the peak RSS of each size's run, and writes
+the results as JSON. With --compare, the run fails if any timing regressed past the threshold.
+
+Usage:
+    python benchmarks/run.py --sizes 1000,100000,1000000 --output results.json
+    python benchmarks/run.py --sizes 1000,100000 --compare baseline.json --threshold 0.25
+"""
+import argparse
+import builtins
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import diary_index  # noqa: E402
+import rolling_window  # noqa: E402
+from diary_mmap import MappedDiary  # noqa: E402
+from diary_writer import already_entered, append_once  # noqa: E402
+from mood_assessor import assess_mood  # noqa: E402
+
+MOODS = [2, 1, 0, -1, -2]
+# how likely each mood is to follow the previous one: users tend to stay in a mood for a while
+STAY_PROBABILITY = 0.6
+MOOD_WEIGHTS = [0.2, 0.3, 0.25, 0.15, 0.1]
+REPEAT = 5  # timings of warm paths are the best of this many runs
+
+
+def generate_diary(path, num_entries, seed=0):
+    """
+    Write a synthetic text diary whose last entry is dated the day before yesterday.
+    Dates wrap around once the calendar runs out, which only happens beyond ~730,000 entries.
+    :param path: path of the diary to write.
+    :param num_entries: number of entries.
+    :param seed: random seed, so runs are comparable.
+    """
+    rng = random.Random(seed)
+    last = datetime.date.today().toordinal() - 2
+    span = last  # day 1 is 0001-01-01
+    mood = rng.choices(MOODS, MOOD_WEIGHTS)[0]
+    with open(path, "w", encoding="utf-8") as f:
+        chunk = []
+        for i in range(num_entries):
+            if rng.random() > STAY_PROBABILITY:
+                mood = rng.choices(MOODS, MOOD_WEIGHTS)[0]
+            day = last - (num_entries - 1 - i) % span
+            chunk.append(f"{datetime.date.fromordinal(day)}: {mood}\n")
+            if len(chunk) == 100_000:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+
+def remove_sidecars(path):
+    for suffix in (diary_index.INDEX_SUFFIX, rolling_window.CHECKPOINT_SUFFIX):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def best_of(func, *args, repeat=REPEAT):
+    return min(timed(func, *args) for _ in range(repeat))
+
+
+def run_size(num_entries, results):
+    """
+    Time every stage for one diary size; runs in its own process so its peak RSS can be measured.
+    :param num_entries: number of entries in the synthetic diary.
+    :param results: a multiprocessing queue receiving the timings.
+    """
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mood_diary.txt")
+        generate_diary(path, num_entries)
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        day = yesterday.toordinal()
+
+        # duplicate check: cold builds the index, warm reuses it
+        remove_sidecars(path)
+        timings["check_cold"] = timed(already_entered, path, day)
+        timings["check_warm"] = best_of(already_entered, path, day)
+
+        # diagnosis of the latest window: cold reads the diary tail, warm reads the checkpoint
+        timings["diagnose_cold"] = best_of(lambda: rolling_window.resume(path).diagnosis)
+        rolling_window.resume(path).save(rolling_window.checkpoint_path(path), path)
+        timings["diagnose_warm"] = best_of(lambda: rolling_window.resume(path).diagnosis)
+
+        # locked, fsynced append of yesterday's entry with its duplicate re-check
+        timings["append"] = timed(append_once, path, yesterday, 1)
+
+        # the full interactive run for today, with sidecars current
+        original_input = builtins.input
+        builtins.input = lambda prompt: "happy"
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                assess_mood(path)
+                timings["assess_mood_warm"] = time.perf_counter() - start
+        finally:
+            builtins.input = original_input
+
+        # streaming and batch APIs over the whole history
+        def stream():
+            window = rolling_window.RollingMoodWindow()
+            with MappedDiary(path) as diary:
+                for score in diary.all().scores():
+                    window.push(score)
+                    window.diagnosis
+
+        timings["stream_all"] = timed(stream)
+        try:
+            import batch_diagnosis
+        except ImportError:
+            pass
+        else:
+            timings["batch_all"] = timed(batch_diagnosis.diagnosis_history, path)
+
+    timings["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put(timings)
+
+
+def run(sizes):
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+    for num_entries in sizes:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_size, args=(num_entries, results))
+        process.start()
+        timings = results.get()
+        process.join()
+        report["results"][str(num_entries)] = timings
+        print(f"{num_entries:>12,} entries")
+        for stage, value in timings.items():
+            if stage == "peak_rss_kb":
+                print(f"    {stage:<18} {value / 1024:10.1f} MB")
+            else:
+                print(f"    {stage:<18} {value * 1000:10.3f} ms")
+    return report
+
+
+def compare(report, baseline, threshold):
+    """
+    :param report: results of this run.
+    :param baseline: results of an earlier run.
+    :param threshold: allowed slowdown, e.g. 0.25 for 25%.
+    :returns: descriptions of the stages that regressed past the threshold.
+    """
+    regressions = []
+    for size, timings in report["results"].items():
+        for stage, value in timings.items():
+            old = baseline["results"].get(size, {}).get(stage)
+            if old and value > old * (1 + threshold):
+                regressions.append(f"{size} entries, {stage}: {old:.6g} -> {value:.6g} (+{value / old - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated diary sizes, up to 100000000")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a baseline run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    report = run([int(size) for size in args.sizes.split(",")])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
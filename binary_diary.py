@@ -0,0 +1,168 @@
+import datetime
+import os
+import struct
+
+MAGIC = b"MOODBIN1"
+VERSION = 1
+# magic, format version, size of one record
+HEADER = struct.Struct("<8sHH4x")
+# day ordinal and score of one entry
+RECORD = struct.Struct("<ib")
+# the same record layout for numpy.frombuffer()
+NUMPY_DTYPE = [("day", "<i4"), ("score", "i1")]
+
+
+def is_binary(path):
+    """
+    :param path: path of a diary.
+    :returns: True if the diary is in the binary format, False if it is text, empty or missing.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def create(path):
+    """
+    Create an empty binary diary, replacing any file at the path.
+    :param path: path of the new diary.
+    """
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+
+def _check_header(header):
+    if len(header) != HEADER.size:
+        raise ValueError("not a binary mood diary")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError("not a binary mood diary, or an unsupported version")
+
+
+def count(path):
+    """
+    :param path: path of a binary diary.
+    :returns: the number of entries, worked out from the file size.
+    """
+    return (os.path.getsize(path) - HEADER.size) // RECORD.size
+
+
+def append(path, day, score):
+    """
+    Append one entry to a binary diary.
+    :param path: path of the diary.
+    :param day: day ordinal of the entry.
+    :param score: score of the entry.
+    """
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(day, score))
+
+
+def read_buffer(path):
+    """
+    Read the records of a binary diary.
+    :param path: path of the diary.
+    :returns: a memoryview over the records, without the header.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    _check_header(data[: HEADER.size])
+    usable = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+    return memoryview(data)[HEADER.size : usable]
+
+
+def iter_records(buffer):
+    """
+    :param buffer: records as returned by read_buffer().
+    :returns: an iterator of (day, score) tuples.
+    """
+    return RECORD.iter_unpack(buffer)
+
+
+def as_array(buffer):
+    """
+    View records as a numpy structured array with 'day' and 'score' fields, without copying them.
+    :param buffer: records as returned by read_buffer().
+    """
+    import numpy as np
+
+    return np.frombuffer(buffer, dtype=np.dtype(NUMPY_DTYPE))
+
+
+def last_records(path, n):
+    """
+    Read only the last n entries of a binary diary, found directly from the file size.
+    :param path: path of the diary.
+    :param n: number of entries.
+    :returns: a list of at most n (day, score) tuples, oldest first.
+    """
+    total = count(path)
+    n = min(n, total)
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(HEADER.size + (total - n) * RECORD.size)
+        return list(RECORD.iter_unpack(f.read(n * RECORD.size)))
+
+
+def contains(path, day):
+    """
+    Check whether a binary diary has an entry on the given day, by binary search over its fixed-width records.
+    :param path: path of the diary.
+    :param day: a day ordinal.
+    """
+    with open(path, "rb") as f:
+
+        def day_at(i):
+            f.seek(HEADER.size + i * RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))[0]
+
+        lo, hi = 0, count(path)
+        if hi == 0:
+            return False
+        last = day_at(hi - 1)
+        if day >= last:
+            return day == last  # the usual "already entered today" case
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if day_at(mid) < day:
+                lo = mid + 1
+            else:
+                hi = mid
+        return day_at(lo) == day
+
+
+def text_to_binary(text_path, binary_path):
+    """
+    Convert a 'YYYY-MM-DD: n' text diary to the binary format.
+    :param text_path: path of the text diary.
+    :param binary_path: path of the binary diary to write.
+    :raises ValueError: if a line of the text diary is not a valid entry.
+    """
+    tmp_path = str(binary_path) + ".tmp"
+    with open(text_path, encoding="utf-8") as src, open(tmp_path, "wb") as dst:
+        dst.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        for line_number, line in enumerate(src, start=1):
+            try:
+                date_text, score_text = line.rstrip("\n").split(": ")
+                day = datetime.date.fromisoformat(date_text).toordinal()
+                dst.write(RECORD.pack(day, int(score_text)))
+            except (ValueError, struct.error) as e:
+                os.remove(tmp_path)
+                raise ValueError(f"{text_path}, line {line_number}: invalid entry {line!r}") from e
+    os.replace(tmp_path, binary_path)
+
+
+def binary_to_text(binary_path, text_path):
+    """
+    Convert a binary diary back to the 'YYYY-MM-DD: n' text format.
+    :param binary_path: path of the binary diary.
+    :param text_path: path of the text diary to write.
+    """
+    tmp_path = str(text_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as dst:
+        for day, score in iter_records(read_buffer(binary_path)):
+            dst.write(f"{datetime.date.fromordinal(day)}: {score}\n")
+    os.replace(tmp_path, text_path)
@@ -0,0 +1,92 @@
+"""
+A warm process that runs main.py subcommands sent over a Unix socket, so repeated invocations skip interpreter
+startup and module imports. Each request is one JSON line, {"argv": [...]}, answered with one JSON line,
+{"code": exit status, "stdout": "...", "stderr": "..."}. Any client that can write to a Unix socket works,
+e.g. echo '{"argv": ["diagnose"]}' | socat - UNIX-CONNECT:/tmp/mood.sock
+Commands run one at a time, in the daemon's working directory.
+"""
+import json
+import socket
+
+
+def _no_input(prompt=""):
+    raise RuntimeError("no interactive input through the daemon, give the mood with --mood")
+
+
+def run_command(argv):
+    """
+    Run one subcommand in this process, capturing its output.
+    :param argv: the subcommand and its arguments.
+    :returns: the response as a dict.
+    """
+    import builtins
+    import contextlib
+    import io
+    import main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    original_input = builtins.input
+    builtins.input = _no_input
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            if argv and argv[0] in ("daemon", "--via"):
+                raise RuntimeError("the daemon cannot run that command")
+            code = main.main(list(argv))
+    except SystemExit as e:  # argparse errors and --help
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        print(f"error: {e}", file=stderr)
+        code = 1
+    finally:
+        builtins.input = original_input
+    return {"code": code or 0, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def serve(socket_path, max_requests=None):
+    """
+    Answer requests until interrupted.
+    :param socket_path: path of the Unix socket to listen on; a stale socket file is replaced.
+    :param max_requests: stop after this many requests, for tests.
+    """
+    import os
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    served = 0
+    try:
+        while max_requests is None or served < max_requests:
+            connection, _ = server.accept()
+            with connection, connection.makefile("rwb") as stream:
+                try:
+                    argv = json.loads(stream.readline())["argv"]
+                    response = run_command(argv)
+                except (ValueError, KeyError, TypeError):
+                    response = {"code": 2, "stdout": "", "stderr": "error: bad request\n"}
+                stream.write(json.dumps(response).encode("utf-8") + b"\n")
+            served += 1
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def request(socket_path, argv):
+    """
+    Have a running daemon execute a subcommand, and print its output here.
+    :param socket_path: path of the daemon's Unix socket.
+    :param argv: the subcommand and its arguments.
+    :returns: the subcommand's exit status.
+    """
+    import sys
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps({"argv": list(argv)}).encode("utf-8") + b"\n")
+            stream.flush()
+            response = json.loads(stream.readline())
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["code"]
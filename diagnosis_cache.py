@@ -0,0 +1,77 @@
+import collections
+import json
+import os
+from diary_store import current_diagnosis
+
+
+class DiagnosisCache:
+    """
+    Current diagnoses of diaries, keyed by diary path and remembered together with the diary's size and mtime.
+    A diary that has been appended to since its diagnosis was cached no longer matches, so the diagnosis is
+    recomputed on the next lookup. The least recently used diaries are evicted once maxsize is reached,
+    and the cache can be saved to disk so that a restarted process starts warm.
+    """
+
+    def __init__(self, maxsize=10000, path=None, compute=current_diagnosis):
+        """
+        :param maxsize: number of diaries kept.
+        :param path: JSON file the cache is loaded from, if it exists, and saved to.
+        :param compute: function giving the diagnosis of a diary path.
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.compute = compute
+        self.entries = collections.OrderedDict()  # diary path -> [size, mtime_ns, diagnosis]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            self.load()
+
+    def get(self, diary_path):
+        """
+        :param diary_path: path of a diary.
+        :returns: the diary's current diagnosis, or None if it has fewer entries than a window.
+        """
+        key = os.path.abspath(diary_path)
+        stat = os.stat(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[2]
+        self.misses += 1
+        diagnosis = self.compute(key)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, diagnosis]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return diagnosis
+
+    def invalidate(self, diary_path):
+        self.entries.pop(os.path.abspath(diary_path), None)
+
+    def stats(self):
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def save(self):
+        """
+        Write the cache to its file, least recently used entries first.
+        """
+        tmp_path = str(self.path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self.entries.items()), f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """
+        Read the cache back from its file; a missing or unreadable file leaves the cache empty.
+        Entries are checked against their diaries on lookup as usual, so stale ones are never served.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                items = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.entries = collections.OrderedDict((key, entry) for key, entry in items[-self.maxsize :])
@@ -0,0 +1,219 @@
+import datetime
+import mmap
+import os
+import struct
+
+# the index lives next to the diary, e.g. data/mood_diary.txt.idx
+INDEX_SUFFIX = ".idx"
+MAGIC = b"MOODIDX1"
+# magic, size and mtime of the diary the index describes, number of records
+HEADER = struct.Struct("<8sqqq")
+# day ordinal of an entry and the byte offset where its line starts
+RECORD = struct.Struct("<iq")
+
+
+def index_path(diary_path):
+    return str(diary_path) + INDEX_SUFFIX
+
+
+def parse_day(line):
+    """
+    Get the day ordinal from the 'YYYY-MM-DD: n' line of a diary.
+    :param line: the line, as bytes.
+    :returns: the ordinal of the date, or None if the line does not start with a valid date.
+    """
+    try:
+        return datetime.date(int(line[0:4]), int(line[5:7]), int(line[8:10])).toordinal()
+    except ValueError:
+        return None
+
+
+def _diary_state(diary_path):
+    stat = os.stat(diary_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _write_index(diary_path, records, state):
+    path = index_path(diary_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, state[0], state[1], len(records)))
+        for day, offset in records:
+            f.write(RECORD.pack(day, offset))
+    os.replace(tmp_path, path)  # readers never see a half-written index
+
+
+def build_index(diary_path):
+    """
+    Scan the whole diary once and write a fresh index for it.
+    :param diary_path: path of the text diary.
+    """
+    state = _diary_state(diary_path)
+    records = []
+    offset = 0
+    with open(diary_path, "rb") as f:
+        for line in f:
+            day = parse_day(line)
+            if day is not None:
+                records.append((day, offset))
+            offset += len(line)
+    records.sort()  # normally already sorted, since entries are appended in date order
+    _write_index(diary_path, records, state)
+
+
+def _read_header(path):
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    magic, size, mtime_ns, count = HEADER.unpack(header)
+    if magic != MAGIC or os.path.getsize(path) != HEADER.size + count * RECORD.size:
+        return None
+    return size, mtime_ns, count
+
+
+def is_current(diary_path):
+    """
+    Check whether the index on disk still describes the diary, by comparing the diary's size and mtime.
+    :param diary_path: path of the text diary.
+    """
+    header = _read_header(index_path(diary_path))
+    return header is not None and header[:2] == _diary_state(diary_path)
+
+
+class DiaryIndex:
+    """
+    A read-only, memory-mapped view of a diary's index.
+    Records are sorted by day, so lookups are binary searches over the mapped file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.diary_size, self.diary_mtime_ns, self.count = HEADER.unpack_from(self._map, 0)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def record(self, i):
+        """
+        :param i: position of the record, negative positions count from the end.
+        :returns: (day ordinal, byte offset) of the record.
+        """
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("index record out of range")
+        return RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+
+    def bisect_left(self, day):
+        """
+        :param day: a day ordinal.
+        :returns: the position of the first record on or after that day.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[0] < day:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def last_day(self):
+        return self.record(-1)[0] if self.count else None
+
+    def contains(self, day):
+        """
+        Check whether the diary has an entry on the given day.
+        The newest day is checked first, which answers the usual "already entered today" question in O(1).
+        :param day: a day ordinal.
+        """
+        if self.count == 0:
+            return False
+        last = self.last_day()
+        if day >= last:
+            return day == last
+        i = self.bisect_left(day)
+        return self.record(i)[0] == day
+
+    def byte_range(self, first_day, last_day):
+        """
+        Find where the entries between two days (both included) are stored in the diary.
+        :param first_day: ordinal of the first day.
+        :param last_day: ordinal of the last day.
+        :returns: (start, end) byte offsets, suitable for seek() and read(end - start).
+        """
+        lo = self.bisect_left(first_day)
+        hi = self.bisect_left(last_day + 1)
+        if lo >= hi:
+            return 0, 0
+        start = self.record(lo)[1]
+        end = self.record(hi)[1] if hi < self.count else self.diary_size
+        return start, end
+
+
+def load_index(diary_path):
+    """
+    Open the diary's index, rebuilding it first if it is missing or the diary has changed since it was written.
+    :param diary_path: path of the text diary.
+    :returns: a DiaryIndex; close it when done.
+    """
+    if not is_current(diary_path):
+        build_index(diary_path)
+    return DiaryIndex(index_path(diary_path))
+
+
+def record_append(diary_path, day, offset):
+    """
+    Add one entry to the index after it has been appended to the diary.
+    If the index did not describe the diary exactly as it was before the append, it is rebuilt instead.
+    :param diary_path: path of the text diary.
+    :param day: ordinal of the new entry's date.
+    :param offset: byte offset where the new entry's line starts, i.e. the diary size before the append.
+    """
+    record_appends(diary_path, [(day, offset)])
+
+
+def record_appends(diary_path, records):
+    """
+    Add several entries to the index after they have been appended to the diary, rewriting the header once.
+    :param diary_path: path of the text diary.
+    :param records: (day ordinal, byte offset) of each new entry, in diary order.
+    """
+    if not records:
+        return
+    path = index_path(diary_path)
+    header = _read_header(path)
+    if header is None or header[0] != records[0][1]:
+        build_index(diary_path)
+        return
+    size, mtime_ns, count = header
+    last_day = None
+    if count:
+        with open(path, "rb") as f:
+            f.seek(HEADER.size + (count - 1) * RECORD.size)
+            last_day = RECORD.unpack(f.read(RECORD.size))[0]
+    for day, _ in records:
+        if last_day is not None and day < last_day:
+            build_index(diary_path)  # out of order, re-sort everything
+            return
+        last_day = day
+    state = _diary_state(diary_path)
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size + count * RECORD.size)
+        f.write(b"".join(RECORD.pack(day, offset) for day, offset in records))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, state[0], state[1], count + len(records)))
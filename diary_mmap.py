@@ -0,0 +1,186 @@
+import array
+import mmap
+import os
+import binary_diary
+from diary_index import parse_day
+
+
+class MappedDiary:
+    """
+    A read-only memory map of a diary, in either format, that hands out lazy views of its entries.
+    Only the bytes present when the diary was opened are mapped, and for text diaries a trailing line without
+    its line break is left out, so entries appended by another process while the map is open are simply not seen.
+    Writers that rewrite a diary replace the file rather than truncating it, which keeps an open map valid.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        self.binary = self._map[: len(binary_diary.MAGIC)] == binary_diary.MAGIC
+        if self.binary:
+            records = (size - binary_diary.HEADER.size) // binary_diary.RECORD.size
+            self.start = binary_diary.HEADER.size
+            self.end = self.start + records * binary_diary.RECORD.size
+        else:
+            self.start = 0
+            self.end = self._map.rfind(b"\n") + 1  # complete lines only
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def all(self):
+        """
+        :returns: a view of every entry.
+        """
+        return self._view(self.start, self.end)
+
+    def last(self, n):
+        """
+        :param n: number of entries.
+        :returns: a view of the last n entries, found by walking back from the end of the map.
+        """
+        if n <= 0:
+            return self._view(self.end, self.end)
+        if self.binary:
+            return self._view(max(self.start, self.end - n * binary_diary.RECORD.size), self.end)
+        pos = self.end - 1  # the final line break
+        for _ in range(n):
+            pos = self._map.rfind(b"\n", self.start, pos)
+            if pos < 0:
+                return self._view(self.start, self.end)
+        return self._view(pos + 1, self.end)
+
+    def between(self, first_day, last_day):
+        """
+        :param first_day: ordinal of the first day.
+        :param last_day: ordinal of the last day, included.
+        :returns: a view of the entries between the two days, found by binary search over the sorted entries.
+        """
+        return self._view(self._bisect(first_day), self._bisect(last_day + 1))
+
+    def _view(self, start, end):
+        if self.binary:
+            return BinaryView(self._map, start, end)
+        return TextView(self._map, start, end)
+
+    def _bisect(self, day):
+        # byte offset of the first entry on or after the day
+        if self.binary:
+            size = binary_diary.RECORD.size
+            lo, hi = 0, (self.end - self.start) // size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if binary_diary.RECORD.unpack_from(self._map, self.start + mid * size)[0] < day:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return self.start + lo * size
+        lo, hi = self.start, self.end  # both are always line starts
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = max(self._map.rfind(b"\n", lo, mid) + 1, lo)
+            line_end = self._map.find(b"\n", line_start, self.end) + 1
+            line_day = parse_day(self._map[line_start : line_start + 10])
+            if line_day is None or line_day < day:
+                lo = line_end
+            else:
+                hi = line_start
+        return lo
+
+
+class BinaryView:
+    """
+    A lazy view of fixed-width binary records; records are unpacked only when accessed.
+    """
+
+    def __init__(self, buffer, start, end):
+        self._buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return (self.end - self.start) // binary_diary.RECORD.size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            first, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("views only support contiguous slices")
+            size = binary_diary.RECORD.size
+            return BinaryView(self._buffer, self.start + first * size, self.start + max(first, stop) * size)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("view index out of range")
+        return binary_diary.RECORD.unpack_from(self._buffer, self.start + i * binary_diary.RECORD.size)
+
+    def __iter__(self):
+        return binary_diary.RECORD.iter_unpack(memoryview(self._buffer)[self.start : self.end])
+
+    def scores(self):
+        return (score for _, score in self)
+
+    def as_array(self):
+        """
+        :returns: the records as a numpy structured array sharing memory with the map.
+        """
+        return binary_diary.as_array(memoryview(self._buffer)[self.start : self.end])
+
+
+class TextView:
+    """
+    A lazy view of complete 'YYYY-MM-DD: n' lines; lines are parsed only when accessed.
+    The line starts are found once, on first use of len() or indexing, and kept as a compact array.
+    """
+
+    def __init__(self, buffer, start, end):
+        self._buffer = buffer
+        self.start = start
+        self.end = end
+        self._starts = None
+
+    def _line_starts(self):
+        if self._starts is None:
+            self._starts = array.array("q")
+            pos = self.start
+            while pos < self.end:
+                self._starts.append(pos)
+                pos = self._buffer.find(b"\n", pos, self.end) + 1
+        return self._starts
+
+    def __len__(self):
+        return len(self._line_starts())
+
+    def __getitem__(self, i):
+        starts = self._line_starts()
+        if isinstance(i, slice):
+            first, stop, step = i.indices(len(starts))
+            if step != 1:
+                raise ValueError("views only support contiguous slices")
+            end = starts[stop] if stop < len(starts) else self.end
+            return TextView(self._buffer, starts[first] if first < stop else end, end)
+        start = starts[i]
+        return self._parse(start, self._buffer.find(b"\n", start, self.end))
+
+    def __iter__(self):
+        pos = self.start
+        while pos < self.end:
+            line_end = self._buffer.find(b"\n", pos, self.end)
+            yield self._parse(pos, line_end)
+            pos = line_end + 1
+
+    def _parse(self, start, line_end):
+        line = self._buffer[start:line_end]
+        return parse_day(line), int(line[12:])
+
+    def scores(self):
+        return (score for _, score in self)
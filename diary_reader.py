@@ -0,0 +1,62 @@
+import os
+from diary_mmap import MappedDiary
+
+# number of bytes read per step when walking backwards through a diary
+BLOCK_SIZE = 64 * 1024
+
+
+def tail_lines(path, n, block_size=BLOCK_SIZE):
+    """
+    Return the last n lines of a text file without reading the whole file.
+    The file is read backwards from its end in fixed-size blocks until enough line breaks have been seen,
+    so the cost depends on the size of the requested lines, not on the size of the file.
+    :param path: path of the file to read.
+    :param n: number of lines to return.
+    :param block_size: number of bytes to read per step.
+    :returns: a list of at most n lines, oldest first, without their line breaks.
+    """
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        blocks = []
+        breaks = 0
+        # n + 1 line breaks guarantee that the oldest of the n lines is complete
+        while pos > 0 and breaks <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            breaks += block.count(b"\n")
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()  # the final line break does not start a new line
+    if pos > 0:
+        lines.pop(0)  # the first line may have been cut in half
+    return [line.decode("utf-8") for line in lines[-n:]]
+
+
+def has_entry_for(path, date_text):
+    """
+    Check whether the diary already holds an entry for the given date.
+    Entries are appended in date order, so only the newest line needs to be looked at.
+    :param path: path of the diary file.
+    :param date_text: the date as a 'YYYY-MM-DD' string.
+    :returns: True if the newest entry was made on that date.
+    """
+    last = tail_lines(path, 1)
+    return bool(last) and last[0].startswith(date_text + ":")
+
+
+def last_scores(path, n):
+    """
+    Get the scores of the last n entries of a diary, in either the text or the binary format.
+    :param path: path of the diary.
+    :param n: number of entries.
+    :returns: a list of at most n scores, oldest first.
+    """
+    with MappedDiary(path) as diary:
+        return list(diary.last(n).scores())
@@ -0,0 +1,114 @@
+import collections
+import hashlib
+import itertools
+import os
+import rolling_window
+from mood_rules import WINDOW
+
+DIARY_NAME = "mood_diary.txt"
+STORE_ROOT = "data/users"
+
+
+class DiaryStore:
+    """
+    Diaries for many users, one directory per user, spread over shard directories named after a hash of the user ID
+    so that no single directory grows too large, e.g. data/users/3f/alice/mood_diary.txt.
+    """
+
+    def __init__(self, root=STORE_ROOT, shard_width=2):
+        """
+        :param root: directory holding the shard directories.
+        :param shard_width: number of hex digits of the hash used to name a shard, i.e. 16 ** shard_width shards.
+        """
+        self.root = str(root)
+        self.shard_width = shard_width
+
+    def shard(self, user):
+        return hashlib.sha1(user.encode("utf-8")).hexdigest()[: self.shard_width]
+
+    def user_dir(self, user):
+        if not user or user in (".", "..") or "/" in user or os.sep in user:
+            raise ValueError(f"invalid user ID: {user!r}")
+        return os.path.join(self.root, self.shard(user), user)
+
+    def diary_path(self, user, create=False):
+        """
+        :param user: the user ID.
+        :param create: whether to create the user's directory if it does not exist yet.
+        :returns: path of the user's diary.
+        """
+        user_dir = self.user_dir(user)
+        if create:
+            os.makedirs(user_dir, exist_ok=True)
+        return os.path.join(user_dir, DIARY_NAME)
+
+    def users(self):
+        """
+        :returns: an iterator over the IDs of all users with a diary, shard by shard.
+        """
+        if not os.path.isdir(self.root):
+            return
+        for shard in sorted(os.listdir(self.root)):
+            shard_dir = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for user in sorted(os.listdir(shard_dir)):
+                if os.path.isfile(os.path.join(shard_dir, user, DIARY_NAME)):
+                    yield user
+
+    def assess_mood(self, user):
+        """
+        Run the interactive assessment for one user.
+        :param user: the user ID.
+        """
+        from mood_assessor import assess_mood
+
+        assess_mood(self.diary_path(user, create=True))
+
+
+def current_diagnosis(diary_path, window=WINDOW):
+    """
+    :param diary_path: path of a diary.
+    :param window: window length.
+    :returns: the diagnosis for the diary's latest window, or None if it has fewer entries than that.
+    """
+    return rolling_window.resume(diary_path, window).diagnosis
+
+
+def _diagnose_chunk(chunk, window):
+    # runs in a worker process
+    return [(user, current_diagnosis(path, window)) for user, path in chunk]
+
+
+def assess_all(store, users=None, chunk_size=256, max_workers=None, max_pending=None, window=WINDOW):
+    """
+    Diagnose many users' diaries across a pool of worker processes.
+    Users are sent to the workers in chunks, and only a bounded number of chunks is in flight at once,
+    so memory use does not grow with the number of users.
+    :param store: the DiaryStore.
+    :param users: an iterable of user IDs, all users in the store by default.
+    :param chunk_size: number of users per task sent to a worker.
+    :param max_workers: number of worker processes, the number of CPUs by default.
+    :param max_pending: number of chunks in flight, twice the number of workers by default.
+    :param window: window length.
+    :returns: an iterator of (user, diagnosis) in the order the users were given; diagnosis is None for short diaries.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if users is None:
+        users = store.users()
+    paths = ((user, store.diary_path(user)) for user in users)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        while True:
+            chunk = list(itertools.islice(paths, chunk_size))
+            if chunk:
+                pending.append(executor.submit(_diagnose_chunk, chunk, window))
+            if pending and (len(pending) >= max_pending or not chunk):
+                yield from pending.popleft().result()
+            elif not chunk:
+                break
@@ -0,0 +1,190 @@
+import collections
+import contextlib
+import fcntl
+import os
+import binary_diary
+import diary_index
+
+# how hard appends try to survive a crash: fsync after every entry, once per batch, or never
+DURABILITY_MODES = ("entry", "batch", "none")
+# the lock file lives next to the diary, e.g. data/mood_diary.txt.lock
+LOCK_SUFFIX = ".lock"
+
+
+@contextlib.contextmanager
+def locked(diary_path):
+    """
+    Hold an exclusive lock on a diary, shared by every process that writes to it.
+    A separate lock file is used so the lock survives the diary being replaced by a rewrite.
+    :param diary_path: path of the diary.
+    """
+    with open(str(diary_path) + LOCK_SUFFIX, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def already_entered(diary_path, day):
+    """
+    :param diary_path: path of the diary, in either format.
+    :param day: day ordinal.
+    :returns: True if the diary has an entry on that day.
+    """
+    if binary_diary.is_binary(diary_path):
+        return binary_diary.contains(diary_path, day)
+    with diary_index.load_index(diary_path) as index:
+        return index.contains(day)
+
+
+def newest_day(diary_path):
+    """
+    :param diary_path: path of the diary, in either format.
+    :returns: the day ordinal of the newest entry, or None if the diary is empty.
+    """
+    if binary_diary.is_binary(diary_path):
+        last = binary_diary.last_records(diary_path, 1)
+        return last[0][0] if last else None
+    with diary_index.load_index(diary_path) as index:
+        return index.last_day()
+
+
+def entered_days(diary_path, days):
+    """
+    :param diary_path: path of the diary, in either format.
+    :param days: day ordinals.
+    :returns: the set of those days the diary already has an entry on, looked up with a single index load.
+    """
+    if binary_diary.is_binary(diary_path):
+        return {day for day in days if binary_diary.contains(diary_path, day)}
+    with diary_index.load_index(diary_path) as index:
+        return {day for day in days if index.contains(day)}
+
+
+def append_entries(diary_path, entries, fsync=False):
+    """
+    Store new entries at the end of the diary in a single write, in the diary's own format.
+    The caller should hold the diary's lock.
+    :param diary_path: path of the diary.
+    :param entries: (date, score) pairs, in date order.
+    :param fsync: whether to wait for the entries to reach the disk.
+    """
+    if binary_diary.is_binary(diary_path):
+        data = b"".join(binary_diary.RECORD.pack(date.toordinal(), score) for date, score in entries)
+        offsets = None
+    else:
+        lines = [f"{date}: {score}\n".encode("utf-8") for date, score in entries]
+        offset = os.path.getsize(diary_path)
+        offsets = []
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line)
+        data = b"".join(lines)
+    with open(diary_path, "ab") as f:
+        f.write(data)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    if offsets is not None:
+        records = [(date.toordinal(), offset) for (date, _), offset in zip(entries, offsets)]
+        diary_index.record_appends(diary_path, records)
+
+
+def append_entry(diary_path, date, score, fsync=False):
+    """
+    Store a new entry at the end of the diary. The caller should hold the diary's lock.
+    :param diary_path: path of the diary.
+    :param date: date of the entry.
+    :param score: score of the entry.
+    :param fsync: whether to wait for the entry to reach the disk.
+    """
+    append_entries(diary_path, [(date, score)], fsync)
+
+
+def append_once(diary_path, date, score, durability="entry"):
+    """
+    Append an entry unless the diary already has one on that date, checking and writing under the diary's lock
+    so that concurrent writers can never both add an entry for the same day.
+    :param diary_path: path of the diary.
+    :param date: date of the entry.
+    :param score: score of the entry.
+    :param durability: one of DURABILITY_MODES.
+    :returns: True if the entry was written, False if it was a duplicate.
+    """
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"unknown durability mode: {durability!r}")
+    with locked(diary_path):
+        if already_entered(diary_path, date.toordinal()):
+            return False
+        append_entry(diary_path, date, score, fsync=durability != "none")
+        return True
+
+
+class GroupCommitWriter:
+    """
+    Collects entries for any number of diaries and writes them in batches: one write per diary per batch,
+    and, in "batch" durability mode, one fsync per diary per batch instead of one per entry.
+    Duplicates are checked under each diary's lock when the batch is written.
+    """
+
+    def __init__(self, durability="batch", max_pending=10000):
+        """
+        :param durability: one of DURABILITY_MODES.
+        :param max_pending: number of buffered entries that triggers a flush.
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"unknown durability mode: {durability!r}")
+        self.durability = durability
+        self.max_pending = max_pending
+        self.pending = collections.defaultdict(list)
+        self.num_pending = 0
+        self.written = 0
+        self.duplicates = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def add(self, diary_path, date, score):
+        """
+        Buffer an entry, flushing the batch once it is full.
+        :param diary_path: path of the diary.
+        :param date: date of the entry.
+        :param score: score of the entry.
+        """
+        self.pending[str(diary_path)].append((date, score))
+        self.num_pending += 1
+        if self.num_pending >= self.max_pending:
+            self.flush()
+
+    def flush(self):
+        """
+        Write every buffered entry.
+        :returns: the (diary path, date, score) entries that were written; duplicates are dropped and counted.
+        """
+        written = []
+        batch, self.pending, self.num_pending = self.pending, collections.defaultdict(list), 0
+        for diary_path, entries in batch.items():
+            with locked(diary_path):
+                if not os.path.exists(diary_path):
+                    open(diary_path, "ab").close()
+                days = entered_days(diary_path, {date.toordinal() for date, _ in entries})
+                fresh = []
+                for date, score in sorted(entries, key=lambda entry: entry[0]):
+                    day = date.toordinal()
+                    if day in days:
+                        self.duplicates += 1
+                        continue
+                    days.add(day)
+                    fresh.append((date, score))
+                if self.durability == "entry":
+                    for date, score in fresh:
+                        append_entry(diary_path, date, score, fsync=True)
+                elif fresh:
+                    append_entries(diary_path, fresh, fsync=self.durability == "batch")
+            written.extend((diary_path, date, score) for date, score in fresh)
+        self.written += len(written)
+        return written
@@ -0,0 +1,164 @@
+"""
+Bulk import of mood events into the diary store.
+
+Reads 'user,date,mood' lines from files or stdin, one event per line, and appends them to each user's diary
+in large batches. Prints diagnoses as users' windows fill when asked to, and a summary at the end.
+
+Usage: python ingest.py [--root data/users] [--diagnoses] [files...]
+"""
+import argparse
+import collections
+import datetime
+import fileinput
+import sys
+import time
+import rolling_window
+from diary_store import STORE_ROOT, DiaryStore
+from diary_writer import DURABILITY_MODES, GroupCommitWriter, newest_day
+from mood_rules import MOOD_SCORES
+
+HEADER_LINE = "user,date,mood"
+
+
+class IngestStats:
+    def __init__(self):
+        self.lines = 0
+        self.accepted = 0
+        self.rejected = collections.Counter()  # reason -> number of lines
+        self.diagnoses = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def summary(self):
+        rate = self.lines / self.elapsed if self.elapsed else 0.0
+        rejected = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.rejected.items())) or "none"
+        return (
+            f"{self.lines} lines in {self.elapsed:.2f}s ({rate:,.0f} lines/s), "
+            f"{self.accepted} accepted, {sum(self.rejected.values())} rejected ({rejected}), "
+            f"{self.diagnoses} diagnoses"
+        )
+
+
+def parse_events(lines, stats):
+    """
+    Validate event lines.
+    :param lines: an iterable of 'user,date,mood' lines.
+    :param stats: IngestStats that counts lines and rejections.
+    :returns: an iterator of (user, date, score) for the valid lines.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line == HEADER_LINE:
+            continue
+        stats.lines += 1
+        fields = line.split(",")
+        if len(fields) != 3:
+            stats.rejected["malformed"] += 1
+            continue
+        user, date_text, mood = (field.strip() for field in fields)
+        if mood not in MOOD_SCORES:
+            stats.rejected["unknown mood"] += 1
+            continue
+        try:
+            date = datetime.date.fromisoformat(date_text)
+        except ValueError:
+            stats.rejected["bad date"] += 1
+            continue
+        yield user, date, MOOD_SCORES[mood]
+
+
+class _UserState:
+    # what ingestion needs to remember about a user: their newest day and their current window
+    __slots__ = ("path", "last_day", "window")
+
+    def __init__(self, path, last_day, window):
+        self.path = path
+        self.last_day = last_day
+        self.window = window
+
+
+def ingest(lines, store, durability="batch", batch_size=50000, max_users=100000, on_diagnosis=None):
+    """
+    Append a stream of mood events to the users' diaries.
+    Memory stays bounded whatever the input size: at most batch_size entries are buffered before a group commit,
+    and the state of at most max_users users is kept, least recently seen users being dropped first.
+    Events on or before a user's newest stored day are rejected as duplicates, which keeps diaries in date order.
+    :param lines: an iterable of 'user,date,mood' lines.
+    :param store: the DiaryStore to write to.
+    :param durability: one of diary_writer.DURABILITY_MODES.
+    :param batch_size: number of entries written per group commit.
+    :param max_users: number of users whose state is kept in memory.
+    :param on_diagnosis: called with (user, date, diagnosis) whenever a user's window is full after an event.
+    :returns: IngestStats.
+    """
+    stats = IngestStats()
+    users = collections.OrderedDict()
+    with GroupCommitWriter(durability=durability, max_pending=batch_size) as writer:
+        for user, date, score in parse_events(lines, stats):
+            state = users.get(user)
+            if state is None:
+                try:
+                    path = store.diary_path(user, create=True)
+                except ValueError:
+                    stats.rejected["bad user"] += 1
+                    continue
+                state = _load_state(path, writer)
+                users[user] = state
+                if len(users) > max_users:
+                    users.popitem(last=False)
+            else:
+                users.move_to_end(user)
+
+            day = date.toordinal()
+            if state.last_day is not None and day <= state.last_day:
+                stats.rejected["duplicate"] += 1
+                continue
+            writer.add(state.path, date, score)
+            stats.accepted += 1
+            state.last_day = day
+            state.window.push(score)
+            if state.window.is_full():
+                stats.diagnoses += 1
+                if on_diagnosis is not None:
+                    on_diagnosis(user, date, state.window.diagnosis)
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
+def _load_state(path, writer):
+    if path in writer.pending:
+        writer.flush()  # the user was dropped from memory with entries still buffered
+    open(path, "a").close()
+    return _UserState(path, newest_day(path), rolling_window.resume(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="files of 'user,date,mood' lines, stdin by default")
+    parser.add_argument("--root", default=STORE_ROOT, help="root directory of the diary store")
+    parser.add_argument("--durability", choices=DURABILITY_MODES, default="batch")
+    parser.add_argument("--batch-size", type=int, default=50000, help="entries per group commit")
+    parser.add_argument("--max-users", type=int, default=100000, help="users whose state is kept in memory")
+    parser.add_argument("--diagnoses", action="store_true", help="print 'user,date,diagnosis' as windows fill")
+    args = parser.parse_args()
+
+    on_diagnosis = None
+    if args.diagnoses:
+
+        def on_diagnosis(user, date, diagnosis):
+            print(f"{user},{date},{diagnosis}")
+
+    with fileinput.input(args.files, encoding="utf-8") as lines:
+        stats = ingest(
+            lines,
+            DiaryStore(args.root),
+            durability=args.durability,
+            batch_size=args.batch_size,
+            max_users=args.max_users,
+            on_diagnosis=on_diagnosis,
+        )
+    print(stats.summary(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,126 @@
-from mood_assessor import *
-def main():
-    assess_mood()
-main()
\ No newline at end of file
+"""
+Command-line entry point. Run with no arguments to enter today's mood, exactly as assess_mood() does.
+
+Subcommands:
+    record [--mood MOOD]    store today's mood, asking for it unless it is given
+    check                   tell whether a mood was already entered today (exit status 1 if not)
+    diagnose                print the diagnosis for the latest week
+    batch                   diagnose every user in the diary store
+    daemon --socket PATH    keep a warm process running that serves commands
+
+Put --via PATH before a subcommand to have a running daemon execute it. Modules are only imported by the
+subcommands that need them, so each invocation pays only for what it uses.
+"""
+import sys
+
+
+def _diary_path(args):
+    if args.user is not None:
+        from diary_store import DiaryStore
+
+        return DiaryStore(args.root).diary_path(args.user, create=True)
+    return args.diary
+
+
+def cmd_record(args):
+    from mood_assessor import assess_mood, record_mood
+
+    if args.mood is None:
+        assess_mood(_diary_path(args))
+    else:
+        record_mood(args.mood, _diary_path(args))
+    return 0
+
+
+def cmd_check(args):
+    from mood_assessor import ALREADY_ENTERED, check_today
+
+    if check_today(_diary_path(args)):
+        print(ALREADY_ENTERED)
+        return 0
+    print("You have not entered your mood today.")
+    return 1
+
+
+def cmd_diagnose(args):
+    import rolling_window
+
+    diagnosis = rolling_window.resume(_diary_path(args)).diagnosis
+    if diagnosis is None:
+        print("Not enough entries for a diagnosis yet.")
+    else:
+        print(f"Your diagnosis: {diagnosis}!")
+    return 0
+
+
+def cmd_batch(args):
+    from diary_store import DiaryStore, assess_all
+
+    results = assess_all(DiaryStore(args.root), chunk_size=args.chunk_size, max_workers=args.workers)
+    for user, diagnosis in results:
+        print(f"{user}: {diagnosis or '-'}")
+    return 0
+
+
+def cmd_daemon(args):
+    from cli_daemon import serve
+
+    serve(args.socket)
+    return 0
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    diary = argparse.ArgumentParser(add_help=False)
+    diary.add_argument("--diary", default="data/mood_diary.txt", help="path of the diary")
+    diary.add_argument("--user", help="use this user's diary in the diary store instead")
+    diary.add_argument("--root", default="data/users", help="root directory of the diary store")
+
+    record = subcommands.add_parser("record", parents=[diary], help="store today's mood")
+    record.add_argument("--mood", choices=["happy", "relaxed", "apathetic", "sad", "angry"])
+    record.set_defaults(func=cmd_record)
+
+    check = subcommands.add_parser("check", parents=[diary], help="tell whether a mood was entered today")
+    check.set_defaults(func=cmd_check)
+
+    diagnose = subcommands.add_parser("diagnose", parents=[diary], help="print the latest diagnosis")
+    diagnose.set_defaults(func=cmd_diagnose)
+
+    batch = subcommands.add_parser("batch", help="diagnose every user in the diary store")
+    batch.add_argument("--root", default="data/users", help="root directory of the diary store")
+    batch.add_argument("--workers", type=int, help="number of worker processes")
+    batch.add_argument("--chunk-size", type=int, default=256, help="users per task")
+    batch.set_defaults(func=cmd_batch)
+
+    daemon = subcommands.add_parser("daemon", help="serve commands from a warm process")
+    daemon.add_argument("--socket", required=True, help="path of the Unix socket to listen on")
+    daemon.set_defaults(func=cmd_daemon)
+    return parser
+
+
+def main(argv=None):
+    """
+    :param argv: command-line arguments, sys.argv[1:] by default.
+    :returns: the exit status.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        from mood_assessor import assess_mood
+
+        assess_mood()
+        return 0
+    if argv[0] == "--via":
+        from cli_daemon import request
+
+        return request(argv[1], argv[2:])
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,78 +1,124 @@
 import datetime
-def assess_mood():
-    f = open("data/mood_diary.txt", encoding="utf-8", mode="a+") # open + create file
-    date_today = str(datetime.date.today()) # get today's date
+import os
+import rolling_window
+from diary_writer import already_entered, append_entry, locked
+from mood_rules import MOOD_SCORES, WINDOW
 
+DIARY_PATH = "data/mood_diary.txt"
+PROMPT = "Enter your mood: "
+ALREADY_ENTERED = "Sorry, you have already entered your mood today."
+
+
+def check_today(diary_path):
+    """
+    Create the diary if it is missing and check whether it already has an entry for today.
+    :param diary_path: path of the diary.
+    :returns: True if a mood was already entered today.
+    """
+    os.makedirs(os.path.dirname(diary_path) or ".", exist_ok=True)
+    open(diary_path, encoding="utf-8", mode="a").close() # create the file if it is missing
+    date_today = datetime.date.today() # get today's date
+    return already_entered(diary_path, date_today.toordinal())
+
+
+def store_mood(diary_path, num_mood):
+    """
+    Store today's score, checking again under the lock in case another run stored a mood while we waited for input.
+    :param diary_path: path of the diary.
+    :param num_mood: today's score.
+    :returns: (stored, diagnosis): whether the score was stored, and the diagnosis if there is a full week of entries.
+    """
+    with locked(diary_path):
+        date_today = datetime.date.today()
+        if already_entered(diary_path, date_today.toordinal()):
+            return False, None
+        # the last week before today, from the checkpoint or the end of the diary
+        window = rolling_window.resume(diary_path, WINDOW)
+        append_entry(diary_path, date_today, num_mood, fsync=True)
+        window.push(num_mood)
+        window.save(rolling_window.checkpoint_path(diary_path), diary_path)
+    return True, window.diagnosis
+
+
+async def _run_in_thread(func, *args):
+    import asyncio
+
+    return await asyncio.to_thread(func, *args)
+
+
+async def _run_now(func, *args):
+    return func(*args)
+
+
+async def _ask(mood_source, prompt):
+    if hasattr(mood_source, "__anext__"):
+        return await mood_source.__anext__()
+    return await mood_source(prompt)
+
+
+async def assess_mood_async(mood_source, diary_path=DIARY_PATH, output=print, run_io=_run_in_thread):
+    """
+    Run one assessment without blocking the event loop: moods come from an async source and diary I/O runs in
+    a worker thread, so many sessions can share one loop.
+    :param mood_source: an async iterator of mood strings, or an async function taking the prompt and returning one.
+    :param diary_path: path of the diary.
+    :param output: function called with each line of output.
+    :param run_io: async function that runs a blocking function with its arguments, a thread pool by default.
+    :returns: the diagnosis, or None if there was none.
+    """
 #check if already completed today
-    f.seek(0)
-    entries = f.readlines()
-    for entry in entries:
-         if date_today in entry:
-                print("Sorry, you have already entered your mood today.")
-                return 
+    if await run_io(check_today, diary_path):
+        output(ALREADY_ENTERED)
+        return None
 
 # get mood
-    mood = input("Enter your mood: ")
-    num_mood = 0
-    while not mood in ["happy", "relaxed", "apathetic", "sad", "angry"]:
-        mood = input("Enter your mood: ")
-    if mood == "happy":
-        num_mood = 2
-    elif mood == "relaxed":
-        num_mood = 1
-    elif mood == "apathetic":
-        num_mood = 0
-    elif mood == "sad":
-        num_mood = -1
-    elif mood == "angry":
-        num_mood = -2
+    mood = await _ask(mood_source, PROMPT)
+    while not mood in MOOD_SCORES:
+        mood = await _ask(mood_source, PROMPT)
 
 #store data
-    f.write(f"{date_today}: {num_mood}\n")
-    f.seek(0)
-    entries = f.readlines()
-    if len(entries) >= 7:
-        mood_entries = []
-        for entry in entries [-7: ]:
-            sep_mood = int(entry.split(": ")[1])
-            mood_entries.append(sep_mood)
-
-# determining diagnosis
-    # average mood by default
-        total_mood = sum(mood_entries)
-        average_mood = round(total_mood/7)
-        if average_mood == 2:
-            diagnosis = "happy"
-        elif average_mood == 1:
-            diagnosis = "relaxed"
-        elif average_mood == 0:
-            diagnosis = "apathetic"
-        elif average_mood == -1:
-            diagnosis = "sad"
-        elif average_mood == -2:
-            diagnosis = "angry"
-
-    # changing diagnosis from default
-        amount_happy = 0
-        amount_sad = 0
-        amount_apathetic = 0
-
-        for mood in mood_entries:
-            if mood == 2:
-                amount_happy += 1
-            if mood == -1:
-                amount_sad += 1
-            elif mood == 0:
-                amount_apathetic += 1
-
-        if amount_happy >= 5:
-            diagnosis = "manic"
-        elif amount_sad >= 4:
-            diagnosis = "depressive"
-        elif amount_apathetic >= 6:
-            diagnosis = "schizoid"
-    
-    # print diagnosis
-        print(f"Your diagnosis: {diagnosis}!")
-
-        f.close() # close file
\ No newline at end of file
+    stored, diagnosis = await run_io(store_mood, diary_path, MOOD_SCORES[mood])
+    if not stored:
+        output(ALREADY_ENTERED)
+        return None
+
+# print diagnosis once there is a full week of entries
+    if diagnosis is not None:
+        output(f"Your diagnosis: {diagnosis}!")
+    return diagnosis
+
+
+async def _input(prompt):
+    return input(prompt)
+
+
+def _run_sync(coroutine):
+    # the coroutine only awaits functions that finish straight away, so it completes on its first step
+    # without an event loop
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("assess_mood_async() suspended without an event loop")
+
+
+def record_mood(mood, diary_path=DIARY_PATH, output=print):
+    """
+    Store a given mood for today without asking for it, with the same checks and output as assess_mood().
+    :param mood: one of the accepted moods.
+    :param diary_path: path of the diary.
+    :param output: function called with each line of output.
+    :returns: the diagnosis, or None if there was none.
+    """
+    if mood not in MOOD_SCORES:
+        raise ValueError(f"unknown mood: {mood!r}")
+
+    async def given(prompt):
+        return mood
+
+    return _run_sync(assess_mood_async(given, diary_path, output=output, run_io=_run_now))
+
+
+def assess_mood(diary_path=DIARY_PATH):
+    _run_sync(assess_mood_async(_input, diary_path, run_io=_run_now))
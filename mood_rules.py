@@ -0,0 +1,155 @@
+import itertools
+
+# the rules as first written in assess_mood(): moods and their scores, the window length, and the threshold rules,
+# checked in order with the first match winning; when none matches the diagnosis is the rounded average mood
+DEFAULT_CONFIG = {
+    "moods": {"happy": 2, "relaxed": 1, "apathetic": 0, "sad": -1, "angry": -2},
+    "window": 7,
+    "rules": [
+        {"diagnosis": "manic", "mood": "happy", "at_least": 5},
+        {"diagnosis": "depressive", "mood": "sad", "at_least": 4},
+        {"diagnosis": "schizoid", "mood": "apathetic", "at_least": 6},
+    ],
+}
+
+NO_DIAGNOSIS = -1  # code for positions that do not have a full window yet
+
+
+class MoodRules:
+    """
+    A rule config compiled into a lookup table.
+    A window is described by how many of its entries have each score; that count vector is encoded as a key, and
+    table[key] is the code of the window's diagnosis, so diagnosing a window is a single table lookup whatever
+    the rules or the window length are. Keys can be kept up to date in O(1) as scores enter and leave a window
+    by adding and subtracting stride_of[score].
+    """
+
+    def __init__(self, config):
+        """
+        :param config: a dict shaped like DEFAULT_CONFIG.
+        :raises ValueError: if the config is inconsistent.
+        """
+        self.config = config
+        self.moods = dict(config["moods"])
+        self.window = int(config["window"])
+        self.rules = [dict(rule) for rule in config.get("rules", [])]
+        if self.window < 1:
+            raise ValueError("the window must hold at least one entry")
+        if len(set(self.moods.values())) != len(self.moods):
+            raise ValueError("every mood needs its own score")
+        if any(not -128 <= score <= 127 for score in self.moods.values()):
+            raise ValueError("scores must fit in a signed byte")
+        for rule in self.rules:
+            if rule["mood"] not in self.moods:
+                raise ValueError(f"rule {rule['diagnosis']!r} refers to unknown mood {rule['mood']!r}")
+
+        # one slot per score, lowest first; the last slot's count follows from the others, so it gets no stride
+        self.scores = sorted(self.moods.values())
+        self.mood_of = {score: mood for mood, score in self.moods.items()}
+        self.stride_of = {score: (self.window + 1) ** slot for slot, score in enumerate(self.scores[:-1])}
+        self.stride_of[self.scores[-1]] = 0
+
+        # average moods first, by score, then the diagnoses the rules can give
+        diagnoses = [self.mood_of[score] for score in self.scores]
+        for rule in self.rules:
+            if rule["diagnosis"] not in diagnoses:
+                diagnoses.append(rule["diagnosis"])
+        if len(diagnoses) > 255:
+            raise ValueError("too many diagnoses")
+        self.diagnoses = tuple(diagnoses)
+        self.codes = {diagnosis: code for code, diagnosis in enumerate(self.diagnoses)}
+        self.table = self._compile()
+        self._other_windows = {}
+
+    def _compile(self):
+        # 255 marks keys no window of this length can have
+        table = bytearray([255]) * ((self.window + 1) ** (len(self.scores) - 1))
+        for counts in _count_vectors(len(self.scores), self.window):
+            key = sum(count * self.stride_of[score] for score, count in zip(self.scores, counts))
+            table[key] = self.codes[self._apply(dict(zip(self.scores, counts)))]
+        return table
+
+    def _apply(self, counts):
+        # the rules for one count vector, only used while compiling the table
+        for rule in self.rules:
+            if counts[self.moods[rule["mood"]]] >= rule["at_least"]:
+                return rule["diagnosis"]
+        # average mood by default; round() rounds halves to even, and a rounded average that is not a mood's
+        # score is named after the nearest mood
+        average = sum(score * count for score, count in counts.items()) / self.window
+        rounded = round(average)
+        if rounded in self.mood_of:
+            return self.mood_of[rounded]
+        return self.mood_of[min(self.scores, key=lambda score: (abs(score - average), -score))]
+
+    def key(self, scores):
+        """
+        :param scores: the scores of a full window.
+        :returns: the lookup key of the window.
+        """
+        return sum(self.stride_of[score] for score in scores)
+
+    def diagnose_key(self, key):
+        """
+        :param key: the lookup key of a full window.
+        :returns: the diagnosis.
+        """
+        return self.diagnoses[self.table[key]]
+
+    def diagnose_scores(self, scores):
+        """
+        :param scores: the scores of a full window.
+        :returns: the diagnosis.
+        """
+        return self.diagnose_key(self.key(scores))
+
+    def with_window(self, window):
+        """
+        :param window: a window length.
+        :returns: these rules compiled for another window length, with the same thresholds.
+        """
+        if window == self.window:
+            return self
+        if window not in self._other_windows:
+            self._other_windows[window] = MoodRules(dict(self.config, window=window))
+        return self._other_windows[window]
+
+
+def _count_vectors(slots, total):
+    # every way of spreading total entries over the slots
+    for cuts in itertools.combinations(range(total + slots - 1), slots - 1):
+        bounds = (-1,) + cuts + (total + slots - 1,)
+        yield tuple(bounds[i + 1] - bounds[i] - 1 for i in range(slots))
+
+
+def load_rules(path):
+    """
+    Load and compile a rule config from a JSON file shaped like DEFAULT_CONFIG.
+    :param path: path of the JSON file.
+    :returns: a MoodRules.
+    """
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        return MoodRules(json.load(f))
+
+
+DEFAULT_RULES = MoodRules(DEFAULT_CONFIG)
+
+# the moods a user may enter and the score stored for each
+MOOD_SCORES = DEFAULT_RULES.moods
+WINDOW = DEFAULT_RULES.window  # number of entries used for a diagnosis
+# compact codes for diagnoses, used by the batch paths: the code of an average mood is its score + 2
+DIAGNOSES = DEFAULT_RULES.diagnoses
+DIAGNOSIS_CODES = DEFAULT_RULES.codes
+
+
+def diagnose_scores(scores, rules=DEFAULT_RULES):
+    """
+    Diagnose a full window of scores.
+    :param scores: the scores of the entries in the window.
+    :param rules: the compiled rules, for a window of len(scores) entries.
+    :returns: the diagnosis.
+    """
+    scores = list(scores)
+    return rules.with_window(len(scores)).diagnose_scores(scores)
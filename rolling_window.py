@@ -0,0 +1,132 @@
+import os
+from diary_reader import last_scores
+from mood_rules import DEFAULT_RULES, WINDOW
+
+# the checkpoint lives next to the diary, e.g. data/mood_diary.txt.window
+CHECKPOINT_SUFFIX = ".window"
+
+
+def checkpoint_path(diary_path):
+    return str(diary_path) + CHECKPOINT_SUFFIX
+
+
+class RollingMoodWindow:
+    """
+    The most recent scores of a diary, kept in a ring buffer together with their running sum, per-mood counts and
+    rule lookup key, so that pushing a score and diagnosing the window both take constant time.
+    """
+
+    def __init__(self, size=None, scores=(), rules=DEFAULT_RULES):
+        """
+        :param size: window length, the length the rules were written for by default.
+        :param scores: scores to push straight away, oldest first.
+        :param rules: the compiled diagnosis rules.
+        """
+        self.rules = rules if size is None else rules.with_window(size)
+        self.size = self.rules.window
+        self._ring = [0] * self.size
+        self._next = 0  # position the next score is written to
+        self.filled = 0
+        self.total = 0
+        self.counts = {score: 0 for score in self.rules.scores}
+        self.key = 0
+        for score in scores:
+            self.push(score)
+
+    def push(self, score):
+        """
+        Add the newest score, dropping the oldest one once the window is full.
+        :param score: the score of the new entry.
+        """
+        if self.filled == self.size:
+            old = self._ring[self._next]
+            self.total -= old
+            self.counts[old] -= 1
+            self.key -= self.rules.stride_of[old]
+        else:
+            self.filled += 1
+        self._ring[self._next] = score
+        self._next = (self._next + 1) % self.size
+        self.total += score
+        self.counts[score] += 1
+        self.key += self.rules.stride_of[score]
+
+    def is_full(self):
+        return self.filled == self.size
+
+    def scores(self):
+        """
+        :returns: the scores in the window, oldest first.
+        """
+        start = self._next if self.is_full() else 0
+        return [self._ring[(start + i) % self.size] for i in range(self.filled)]
+
+    @property
+    def diagnosis(self):
+        """
+        The diagnosis for the window, or None while it holds fewer than size entries.
+        """
+        if not self.is_full():
+            return None
+        return self.rules.diagnose_key(self.key)
+
+    def save(self, path, diary_path):
+        """
+        Write the window to a checkpoint file, tagged with the current size and mtime of the diary it was built from.
+        :param path: path of the checkpoint file.
+        :param diary_path: path of the diary the window describes.
+        """
+        import json
+
+        stat = os.stat(diary_path)
+        state = {
+            "size": self.size,
+            "scores": self.scores(),
+            "diary_size": stat.st_size,
+            "diary_mtime_ns": stat.st_mtime_ns,
+        }
+        tmp_path = str(path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, diary_path, size=WINDOW, rules=DEFAULT_RULES):
+        """
+        Read a window back from a checkpoint file.
+        :param path: path of the checkpoint file.
+        :param diary_path: path of the diary the window should describe.
+        :param size: the window size wanted.
+        :param rules: the compiled diagnosis rules.
+        :returns: the window, or None if there is no usable checkpoint for the diary as it is now.
+        """
+        import json
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        stat = os.stat(diary_path)
+        if (
+            state.get("size") != size
+            or state.get("diary_size") != stat.st_size
+            or state.get("diary_mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return cls(size, state["scores"], rules)
+
+
+def resume(diary_path, size=WINDOW, rules=DEFAULT_RULES):
+    """
+    Get the window for the diary as it is now, from its checkpoint if that is current,
+    otherwise by reading only the last entries of the diary, in either format.
+    :param diary_path: path of the diary.
+    :param size: the window size.
+    :param rules: the compiled diagnosis rules.
+    :returns: a RollingMoodWindow.
+    """
+    window = RollingMoodWindow.load(checkpoint_path(diary_path), diary_path, size, rules)
+    if window is None:
+        window = RollingMoodWindow(size, last_scores(diary_path, size), rules)
+    return window
@@ -0,0 +1,42 @@
+import datetime
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+from batch_diagnosis import diagnose_all, diagnosis_history, labels  # noqa: E402
+from rolling_window import RollingMoodWindow  # noqa: E402
+
+
+class Tests:
+    def test_matches_rolling_window(self):
+        """
+        Does the vectorized pass give the same diagnosis as the scalar rules at every position?
+        """
+        rng = random.Random(1)
+        scores = [rng.choice([2, 2, 1, 0, 0, 0, -1, -1, -2]) for _ in range(5000)]
+        expected = []
+        window = RollingMoodWindow()
+        for score in scores:
+            window.push(score)
+            expected.append(window.diagnosis)
+        codes = diagnose_all(np.array(scores, dtype=np.int8))
+        assert codes.dtype == np.int8
+        assert labels(codes) == expected
+
+    def test_short_series(self):
+        """
+        Are positions without a full window left undiagnosed?
+        """
+        assert labels(diagnose_all([2, 2, 2])) == [None, None, None]
+
+    def test_diagnosis_history(self, tmp_path):
+        """
+        Are the dates and scores of a diary file read correctly?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("".join(f"2020-01-{day:02d}: -1\n" for day in range(1, 9)), encoding="utf-8")
+        days, codes = diagnosis_history(path)
+        assert days[0] == datetime.date(2020, 1, 1).toordinal()
+        assert days[-1] == datetime.date(2020, 1, 8).toordinal()
+        assert labels(codes) == [None] * 6 + ["depressive", "depressive"]
@@ -0,0 +1,70 @@
+import datetime
+import pytest
+from freezegun import freeze_time
+import binary_diary
+from mood_assessor import assess_mood
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def text_diary(self, tmp_path):
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("".join(f"2020-01-{day:02d}: {day % 5 - 2}\n" for day in range(1, 11)), encoding="utf-8")
+        return path
+
+    def test_round_trip(self, text_diary, tmp_path):
+        """
+        Does converting to the binary format and back give the same text?
+        :param text_diary: the pytest fixture with a text diary, defined in this class.
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        binary_path = tmp_path / "mood_diary.bin"
+        binary_diary.text_to_binary(text_diary, binary_path)
+        assert binary_diary.is_binary(binary_path)
+        assert not binary_diary.is_binary(text_diary)
+        assert binary_diary.count(binary_path) == 10
+        assert binary_path.stat().st_size == binary_diary.HEADER.size + 10 * binary_diary.RECORD.size
+
+        binary_diary.binary_to_text(binary_path, tmp_path / "back.txt")
+        assert (tmp_path / "back.txt").read_text(encoding="utf-8") == text_diary.read_text(encoding="utf-8")
+
+    def test_queries(self, text_diary, tmp_path):
+        """
+        Are the last entries and the days with an entry found from the fixed-width records?
+        :param text_diary: the pytest fixture with a text diary, defined in this class.
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        binary_path = tmp_path / "mood_diary.bin"
+        binary_diary.text_to_binary(text_diary, binary_path)
+        day = datetime.date(2020, 1, 10).toordinal()
+        assert binary_diary.last_records(binary_path, 2) == [(day - 1, 2), (day, -2)]
+        for offset in range(-12, 3):
+            assert binary_diary.contains(binary_path, day + offset) == (-9 <= offset <= 0)
+
+    def test_invalid_text(self, tmp_path):
+        """
+        Is a malformed text line refused rather than silently dropped?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("2020-01-01: 1\nnot an entry\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            binary_diary.text_to_binary(path, tmp_path / "mood_diary.bin")
+        assert not (tmp_path / "mood_diary.bin").exists()
+
+    def test_assess_mood_on_binary_diary(self, text_diary, monkeypatch, capsys):
+        """
+        Does assess_mood() detect a binary diary, append to it and diagnose from it?
+        :param text_diary: the pytest fixture with a text diary, defined in this class.
+        :param monkeypatch: pytest's monkeypatch object, automatically supplied.
+        :param capsys: pytest's capsys output capture fixture, automatically supplied.
+        """
+        binary_diary.text_to_binary(text_diary, text_diary)
+        monkeypatch.setattr("builtins.input", lambda message: "sad")
+        with freeze_time(datetime.date(2020, 1, 11)):
+            assess_mood(str(text_diary))
+            assess_mood(str(text_diary))
+        assert binary_diary.count(text_diary) == 11
+        assert capsys.readouterr().out == (
+            "Your diagnosis: apathetic!\nSorry, you have already entered your mood today.\n"
+        )
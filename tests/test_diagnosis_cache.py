@@ -0,0 +1,62 @@
+import pytest
+from diagnosis_cache import DiagnosisCache
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diaries(self, tmp_path):
+        # three diaries with a full week of sad entries
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"diary{i}.txt"
+            path.write_text("".join(f"2020-01-{day:02d}: -1\n" for day in range(1, 8)), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_hits_and_invalidation(self, diaries):
+        """
+        Is a diagnosis served from the cache until its diary is appended to?
+        :param diaries: the pytest fixture with diary files, defined in this class.
+        """
+        cache = DiagnosisCache()
+        assert cache.get(diaries[0]) == "depressive"
+        assert cache.get(diaries[0]) == "depressive"
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+        with open(diaries[0], "a", encoding="utf-8") as f:
+            f.write("2020-01-08: 2\n2020-01-09: 2\n2020-01-10: 2\n2020-01-11: 2\n")
+        assert cache.get(diaries[0]) == "relaxed"
+        assert cache.misses == 2
+
+    def test_lru_eviction(self, diaries):
+        """
+        Is the least recently used diary evicted first?
+        :param diaries: the pytest fixture with diary files, defined in this class.
+        """
+        cache = DiagnosisCache(maxsize=2)
+        cache.get(diaries[0])
+        cache.get(diaries[1])
+        cache.get(diaries[0])
+        cache.get(diaries[2])  # evicts diary 1
+        assert cache.evictions == 1
+        cache.get(diaries[0])
+        cache.get(diaries[1])
+        assert cache.stats() == {"size": 2, "hits": 2, "misses": 4, "evictions": 2}
+
+    def test_persistence(self, diaries, tmp_path):
+        """
+        Does a cache loaded from disk serve warm?
+        :param diaries: the pytest fixture with diary files, defined in this class.
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "cache.json"
+        cache = DiagnosisCache(path=path)
+        for diary in diaries:
+            cache.get(diary)
+        cache.save()
+
+        calls = []
+        restarted = DiagnosisCache(path=path, compute=calls.append)
+        assert [restarted.get(diary) for diary in diaries] == ["depressive"] * 3
+        assert calls == []
+        assert restarted.hits == 3
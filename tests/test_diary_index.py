@@ -0,0 +1,59 @@
+import datetime
+import pytest
+import diary_index
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diary(self, tmp_path):
+        # a diary with an entry every other day of January 2020
+        path = tmp_path / "mood_diary.txt"
+        lines = [f"{datetime.date(2020, 1, day)}: 1\n" for day in range(1, 32, 2)]
+        path.write_text("".join(lines), encoding="utf-8")
+        return path
+
+    def test_contains(self, diary):
+        """
+        Are exactly the days with an entry found in the index?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        """
+        with diary_index.load_index(diary) as index:
+            assert len(index) == 16
+            for day in range(1, 32):
+                ordinal = datetime.date(2020, 1, day).toordinal()
+                assert index.contains(ordinal) == (day % 2 == 1)
+
+    def test_byte_range(self, diary):
+        """
+        Does a date range map to the bytes holding exactly those entries?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        """
+        with diary_index.load_index(diary) as index:
+            start, end = index.byte_range(
+                datetime.date(2020, 1, 4).toordinal(), datetime.date(2020, 1, 9).toordinal()
+            )
+        with open(diary, "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start).decode("utf-8")
+        assert chunk == "2020-01-05: 1\n2020-01-07: 1\n2020-01-09: 1\n"
+
+    def test_record_append(self, diary):
+        """
+        Is an appended entry added to the index without a rebuild, and is a stale index rebuilt?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        """
+        diary_index.build_index(diary)
+        offset = diary.stat().st_size
+        with open(diary, "a", encoding="utf-8") as f:
+            f.write("2020-02-01: 2\n")
+        diary_index.record_append(diary, datetime.date(2020, 2, 1).toordinal(), offset)
+        assert diary_index.is_current(diary)
+        with diary_index.load_index(diary) as index:
+            assert index.record(-1) == (datetime.date(2020, 2, 1).toordinal(), offset)
+
+        # an edit behind the index's back is noticed and the index is rebuilt
+        diary.write_text("2021-03-03: 0\n", encoding="utf-8")
+        assert not diary_index.is_current(diary)
+        with diary_index.load_index(diary) as index:
+            assert len(index) == 1
+            assert index.contains(datetime.date(2021, 3, 3).toordinal())
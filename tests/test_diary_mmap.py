@@ -0,0 +1,68 @@
+import datetime
+import pytest
+import binary_diary
+from diary_mmap import MappedDiary
+
+
+def day(n):
+    return datetime.date(2020, 1, n).toordinal()
+
+
+class Tests:
+    @pytest.fixture(scope="function", params=["text", "binary"])
+    def diary(self, request, tmp_path):
+        # entries on every other day of January 2020, in either format
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("".join(f"2020-01-{n:02d}: {n % 5 - 2}\n" for n in range(1, 32, 2)), encoding="utf-8")
+        if request.param == "binary":
+            binary_diary.text_to_binary(path, path)
+        return path
+
+    def test_last(self, diary):
+        """
+        Does the last-n view hold the newest entries, oldest first?
+        :param diary: the pytest fixture with a diary in each format, defined in this class.
+        """
+        with MappedDiary(diary) as mapped:
+            view = mapped.last(3)
+            assert len(view) == 3
+            assert list(view) == [(day(27), 0), (day(29), 2), (day(31), -1)]
+            assert view[-1] == (day(31), -1)
+            assert list(view[1:].scores()) == [2, -1]
+            assert len(mapped.last(100)) == 16
+            assert len(mapped.last(0)) == 0
+
+    def test_between(self, diary):
+        """
+        Does a date range view hold exactly the entries between the two days?
+        :param diary: the pytest fixture with a diary in each format, defined in this class.
+        """
+        with MappedDiary(diary) as mapped:
+            assert [d for d, _ in mapped.between(day(4), day(9))] == [day(5), day(7), day(9)]
+            assert [d for d, _ in mapped.between(day(5), day(5))] == [day(5)]
+            assert len(mapped.between(day(2), day(2))) == 0
+            assert len(mapped.between(day(1), day(31))) == 16
+            assert len(mapped.all()) == 16
+
+    def test_appends_after_opening(self, tmp_path):
+        """
+        Are entries appended after the map was opened, including a half-written one, left out of its views?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("2020-01-01: 1\n2020-01-02: 2", encoding="utf-8")
+        with MappedDiary(path) as mapped:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n2020-01-03: 0\n")
+            assert list(mapped.all()) == [(day(1), 1)]
+
+    def test_empty(self, tmp_path):
+        """
+        Does an empty diary give empty views?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("", encoding="utf-8")
+        with MappedDiary(path) as mapped:
+            assert list(mapped.last(7)) == []
+            assert len(mapped.between(day(1), day(31))) == 0
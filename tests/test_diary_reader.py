@@ -0,0 +1,53 @@
+import pytest
+from diary_reader import has_entry_for, tail_lines
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diary(self, tmp_path):
+        # a diary with 100 entries, one per day
+        path = tmp_path / "mood_diary.txt"
+        lines = [f"2020-01-{(i % 28) + 1:02d}: {i % 5 - 2}\n" for i in range(100)]
+        path.write_text("".join(lines), encoding="utf-8")
+        return path, [line.rstrip("\n") for line in lines]
+
+    def test_tail_matches_readlines(self, diary):
+        """
+        Does the backwards reader return the same lines as reading the whole file, for any block size?
+        :param diary: the pytest fixture with a diary file and its lines, defined in this class.
+        """
+        path, lines = diary
+        for block_size in [1, 3, 14, 1000]:
+            for n in [1, 7, 99, 100, 150]:
+                assert tail_lines(path, n, block_size=block_size) == lines[-n:]
+
+    def test_tail_without_final_line_break(self, tmp_path):
+        """
+        Is the last line returned when the file does not end with a line break?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("2020-01-01: 1\n2020-01-02: 2", encoding="utf-8")
+        assert tail_lines(path, 1, block_size=4) == ["2020-01-02: 2"]
+        assert tail_lines(path, 5) == ["2020-01-01: 1", "2020-01-02: 2"]
+
+    def test_empty_file(self, tmp_path):
+        """
+        Does an empty diary have no lines and no entry for any date?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("", encoding="utf-8")
+        assert tail_lines(path, 7) == []
+        assert not has_entry_for(path, "2020-01-01")
+
+    def test_has_entry_for(self, tmp_path):
+        """
+        Is only the date at the start of the newest entry matched?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("2020-01-01: 1\n2020-01-02: 2\n", encoding="utf-8")
+        assert has_entry_for(path, "2020-01-02")
+        assert not has_entry_for(path, "2020-01-01")
+        assert not has_entry_for(path, "2020-01-0")
@@ -0,0 +1,37 @@
+import pytest
+from diary_store import DiaryStore, assess_all
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def store(self, tmp_path):
+        # ten users, user i has i + 3 entries, all of them sad
+        store = DiaryStore(tmp_path / "users")
+        for i in range(10):
+            path = store.diary_path(f"user{i}", create=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for day in range(1, i + 4):
+                    f.write(f"2020-01-{day:02d}: -1\n")
+        return store
+
+    def test_sharded_paths(self, store):
+        """
+        Are diaries placed in hashed shard directories, and are unsafe user IDs refused?
+        :param store: the pytest fixture with a store of diaries, defined in this class.
+        """
+        path = store.diary_path("alice")
+        assert path == f"{store.root}/{store.shard('alice')}/alice/mood_diary.txt"
+        assert len(store.shard("alice")) == 2
+        for user in ["", "..", "a/b"]:
+            with pytest.raises(ValueError):
+                store.diary_path(user)
+        assert sorted(store.users()) == sorted(f"user{i}" for i in range(10))
+
+    def test_assess_all(self, store):
+        """
+        Are all users diagnosed across worker processes, in the order they were given?
+        :param store: the pytest fixture with a store of diaries, defined in this class.
+        """
+        users = [f"user{i}" for i in range(10)]
+        results = list(assess_all(store, users, chunk_size=3, max_workers=2, max_pending=2))
+        assert results == [(user, None if i < 4 else "depressive") for i, user in enumerate(users)]
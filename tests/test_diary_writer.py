@@ -0,0 +1,64 @@
+import datetime
+import multiprocessing
+import pytest
+from diary_writer import GroupCommitWriter, append_once
+
+
+def race_to_append(path, barrier, score):
+    # runs in a separate process
+    barrier.wait()
+    append_once(path, datetime.date(2020, 6, 18), score, durability="none")
+
+
+class Tests:
+    def test_concurrent_appends_same_day(self, tmp_path):
+        """
+        When many processes try to store a mood for the same day at once, is exactly one entry written?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        path = str(tmp_path / "mood_diary.txt")
+        open(path, "w").close()
+        num_processes = 8
+        barrier = multiprocessing.Barrier(num_processes)
+        processes = [
+            multiprocessing.Process(target=race_to_append, args=(path, barrier, i % 5 - 2))
+            for i in range(num_processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        assert len(lines) == 1
+        assert lines[0].startswith("2020-06-18: ")
+
+    @pytest.mark.parametrize("durability", ["entry", "batch", "none"])
+    def test_group_commit(self, tmp_path, durability):
+        """
+        Are batched entries for several diaries written in date order, with duplicates dropped?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        :param durability: the durability mode under test.
+        """
+        paths = [str(tmp_path / f"diary{i}.txt") for i in range(3)]
+        with open(paths[0], "w", encoding="utf-8") as f:
+            f.write("2020-01-01: 2\n")
+        with GroupCommitWriter(durability=durability, max_pending=100) as writer:
+            for path in paths:
+                writer.add(path, datetime.date(2020, 1, 2), 1)
+                writer.add(path, datetime.date(2020, 1, 1), 0)
+                writer.add(path, datetime.date(2020, 1, 2), -1)
+        assert writer.written == 5
+        assert writer.duplicates == 4
+        with open(paths[0], encoding="utf-8") as f:
+            assert f.read() == "2020-01-01: 2\n2020-01-02: 1\n"
+        for path in paths[1:]:
+            with open(path, encoding="utf-8") as f:
+                assert f.read() == "2020-01-01: 0\n2020-01-02: 1\n"
+
+    def test_unknown_durability(self):
+        """
+        Is an unknown durability mode refused?
+        """
+        with pytest.raises(ValueError):
+            GroupCommitWriter(durability="sometimes")
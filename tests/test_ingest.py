@@ -0,0 +1,54 @@
+import datetime
+import pytest
+from diary_store import DiaryStore
+from ingest import ingest
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def store(self, tmp_path):
+        return DiaryStore(tmp_path / "users")
+
+    def test_ingest(self, store):
+        """
+        Are valid events stored, bad and duplicate ones rejected, and diagnoses emitted once a week is full?
+        :param store: the pytest fixture with an empty diary store, defined in this class.
+        """
+        lines = ["user,date,mood\n"]
+        for day in range(1, 9):
+            lines.append(f"alice,2020-01-{day:02d},happy\n")
+            lines.append(f"bob,2020-01-{day:02d},sad\n")
+        lines += [
+            "alice,2020-01-08,sad\n",  # second entry on the same day
+            "alice,2020-01-03,sad\n",  # older than her newest entry
+            "carol,2020-01-01,grumpy\n",
+            "carol,2020-13-01,happy\n",
+            "carol,2020-01-01\n",
+            "../x,2020-01-01,happy\n",
+        ]
+        diagnoses = []
+        stats = ingest(lines, store, batch_size=5, max_users=1, on_diagnosis=lambda *d: diagnoses.append(d))
+
+        assert stats.lines == 22
+        assert stats.accepted == 16
+        assert stats.rejected == {"duplicate": 2, "unknown mood": 1, "bad date": 1, "malformed": 1, "bad user": 1}
+        assert diagnoses == [
+            ("alice", datetime.date(2020, 1, 7), "manic"),
+            ("bob", datetime.date(2020, 1, 7), "depressive"),
+            ("alice", datetime.date(2020, 1, 8), "manic"),
+            ("bob", datetime.date(2020, 1, 8), "depressive"),
+        ]
+        with open(store.diary_path("alice"), encoding="utf-8") as f:
+            assert f.read() == "".join(f"2020-01-{day:02d}: 2\n" for day in range(1, 9))
+
+    def test_resume_on_existing_diaries(self, store):
+        """
+        Does a second import continue from what the diaries already hold?
+        :param store: the pytest fixture with an empty diary store, defined in this class.
+        """
+        ingest([f"alice,2020-01-{day:02d},relaxed" for day in range(1, 7)], store)
+        diagnoses = []
+        stats = ingest(["alice,2020-01-06,sad", "alice,2020-01-07,relaxed"], store,
+                       on_diagnosis=lambda *d: diagnoses.append(d))
+        assert stats.rejected == {"duplicate": 1}
+        assert diagnoses == [("alice", datetime.date(2020, 1, 7), "relaxed")]
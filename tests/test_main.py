@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+import cli_daemon
+from main import main
+
+REPO_ROOT = Path(__file__).parent.parent
+# cumulative import time allowed for everything a 'record' run imports, in microseconds
+IMPORT_BUDGET_US = 150_000
+# modules only some subcommands need, which must not be imported up front
+HEAVY_MODULES = ["numpy", "asyncio", "concurrent.futures", "multiprocessing", "sqlite3", "argparse"]
+
+
+def import_times(module):
+    # cumulative import times reported by python -X importtime, by module name
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diary(self, tmp_path):
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("".join(f"2000-01-{day:02d}: -1\n" for day in range(1, 7)), encoding="utf-8")
+        return str(path)
+
+    def test_import_has_no_side_effects(self):
+        """
+        Does importing main.py leave the program unrun?
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", "import main"], cwd=REPO_ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL
+        )
+        assert result.returncode == 0
+        assert result.stdout == ""
+
+    def test_import_time_budget(self):
+        """
+        Does the record path import within budget, without the modules only other subcommands need?
+        """
+        times = import_times("main")
+        assert times["main"] < IMPORT_BUDGET_US
+        times = import_times("mood_assessor")
+        assert times["mood_assessor"] < IMPORT_BUDGET_US
+        for module in HEAVY_MODULES:
+            assert module not in times
+
+    def test_subcommands(self, diary, capsys):
+        """
+        Do record, check and diagnose work on a given diary?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        :param capsys: pytest's capsys output capture fixture, automatically supplied.
+        """
+        assert main(["check", "--diary", diary]) == 1
+        assert main(["diagnose", "--diary", diary]) == 0
+        assert main(["record", "--diary", diary, "--mood", "sad"]) == 0
+        assert main(["record", "--diary", diary, "--mood", "happy"]) == 0
+        assert main(["check", "--diary", diary]) == 0
+        assert main(["diagnose", "--diary", diary]) == 0
+        assert capsys.readouterr().out.splitlines() == [
+            "You have not entered your mood today.",
+            "Not enough entries for a diagnosis yet.",
+            "Your diagnosis: depressive!",
+            "Sorry, you have already entered your mood today.",
+            "Sorry, you have already entered your mood today.",
+            "Your diagnosis: depressive!",
+        ]
+
+    def test_daemon(self, diary, tmp_path, capsys):
+        """
+        Does a command sent with --via run in the daemon, with its output and exit status passed back?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        :param capsys: pytest's capsys output capture fixture, automatically supplied.
+        """
+        socket_path = str(tmp_path / "mood.sock")
+        server = threading.Thread(target=cli_daemon.serve, args=(socket_path, 3))
+        server.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        assert main(["--via", socket_path, "record", "--diary", diary, "--mood", "sad"]) == 0
+        assert main(["--via", socket_path, "record", "--diary", diary]) == 1  # no input() in the daemon
+        assert main(["--via", socket_path, "check", "--diary", diary]) == 0
+        server.join()
+        captured = capsys.readouterr()
+        assert captured.out == "Your diagnosis: depressive!\nSorry, you have already entered your mood today.\n"
+        assert "--mood" in captured.err
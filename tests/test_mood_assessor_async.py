@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from mood_assessor import assess_mood_async
+
+
+async def moods(*values):
+    for value in values:
+        yield value
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diaries(self, tmp_path):
+        # 200 diaries, each with six happy entries from the past
+        paths = []
+        for i in range(200):
+            path = tmp_path / f"diary{i}.txt"
+            path.write_text("".join(f"2000-01-{day:02d}: 2\n" for day in range(1, 7)), encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    def test_concurrent_sessions(self, diaries):
+        """
+        Do many sessions sharing one event loop each store their mood and print their diagnosis?
+        :param diaries: the pytest fixture with diary files, defined in this class.
+        """
+        outputs = [[] for _ in diaries]
+
+        async def run_all():
+            return await asyncio.gather(
+                *(
+                    assess_mood_async(moods("grumpy", "happy"), path, output=outputs[i].append)
+                    for i, path in enumerate(diaries)
+                )
+            )
+
+        assert asyncio.run(run_all()) == ["manic"] * len(diaries)
+        assert outputs == [["Your diagnosis: manic!"]] * len(diaries)
+        with open(diaries[0], encoding="utf-8") as f:
+            assert len(f.readlines()) == 7
+
+    def test_callback_source_and_same_day(self, diaries):
+        """
+        Does a callback mood source get the prompt, and is a second session on the same day refused?
+        :param diaries: the pytest fixture with diary files, defined in this class.
+        """
+        prompts = []
+        output = []
+
+        async def ask(prompt):
+            prompts.append(prompt)
+            return "sad"
+
+        async def run_twice():
+            await assess_mood_async(ask, diaries[0], output=output.append)
+            await assess_mood_async(ask, diaries[0], output=output.append)
+
+        asyncio.run(run_twice())
+        assert prompts == ["Enter your mood: "]
+        assert output == ["Your diagnosis: manic!", "Sorry, you have already entered your mood today."]
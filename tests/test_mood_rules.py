@@ -0,0 +1,67 @@
+import itertools
+import json
+import pytest
+from mood_rules import DEFAULT_CONFIG, DEFAULT_RULES, DIAGNOSES, MoodRules, diagnose_scores, load_rules
+from rolling_window import RollingMoodWindow
+
+
+def original_diagnosis(mood_entries, window=7):
+    # the rules as they were first written in assess_mood()
+    diagnosis = {2: "happy", 1: "relaxed", 0: "apathetic", -1: "sad", -2: "angry"}[round(sum(mood_entries) / window)]
+    if mood_entries.count(2) >= 5:
+        diagnosis = "manic"
+    elif mood_entries.count(-1) >= 4:
+        diagnosis = "depressive"
+    elif mood_entries.count(0) >= 6:
+        diagnosis = "schizoid"
+    return diagnosis
+
+
+class Tests:
+    def test_default_table_matches_original_rules(self):
+        """
+        Does the compiled table give the original diagnosis for every possible week?
+        """
+        for week in itertools.combinations_with_replacement([-2, -1, 0, 1, 2], 7):
+            assert diagnose_scores(week) == original_diagnosis(list(week))
+        assert DIAGNOSES == ("angry", "sad", "apathetic", "relaxed", "happy", "manic", "depressive", "schizoid")
+        assert len(DEFAULT_RULES.table) == 8**4
+
+    def test_custom_window(self):
+        """
+        Does a 14-day window work from the config alone, with the same per-window cost?
+        """
+        rules = MoodRules(dict(DEFAULT_CONFIG, window=14))
+        window = RollingMoodWindow(rules=rules)
+        assert window.size == 14
+        for score in [-1] * 10 + [2] * 4:
+            window.push(score)
+        assert window.diagnosis == "depressive"
+        assert window.key == rules.key(window.scores())
+        assert DEFAULT_RULES.with_window(14).table == rules.table
+
+    def test_load_rules(self, tmp_path):
+        """
+        Are rules, including new moods and diagnoses, loaded from a JSON file?
+        :param tmp_path: pytest's temporary directory fixture, automatically supplied.
+        """
+        config = {
+            "moods": {"great": 3, "fine": 1, "awful": -3},
+            "window": 3,
+            "rules": [{"diagnosis": "euphoric", "mood": "great", "at_least": 3}],
+        }
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(config), encoding="utf-8")
+        rules = load_rules(path)
+        assert rules.diagnose_scores([3, 3, 3]) == "euphoric"
+        assert rules.diagnose_scores([3, 3, 1]) == "great"  # average 2.33 is nearest to great
+        assert rules.diagnose_scores([-3, 1, 1]) == "fine"  # average -0.33 is nearest to fine
+
+    def test_invalid_config(self):
+        """
+        Are configs with shared scores or rules about unknown moods refused?
+        """
+        with pytest.raises(ValueError):
+            MoodRules(dict(DEFAULT_CONFIG, moods={"happy": 1, "glad": 1}, rules=[]))
+        with pytest.raises(ValueError):
+            MoodRules(dict(DEFAULT_CONFIG, rules=[{"diagnosis": "x", "mood": "bored", "at_least": 1}]))
@@ -0,0 +1,58 @@
+import random
+import pytest
+from rolling_window import RollingMoodWindow, checkpoint_path, resume
+
+
+def original_diagnosis(mood_entries):
+    # the rules as they were first written in assess_mood()
+    average_mood = round(sum(mood_entries) / 7)
+    diagnosis = {2: "happy", 1: "relaxed", 0: "apathetic", -1: "sad", -2: "angry"}[average_mood]
+    amount_happy = mood_entries.count(2)
+    amount_sad = mood_entries.count(-1)
+    amount_apathetic = mood_entries.count(0)
+    if amount_happy >= 5:
+        diagnosis = "manic"
+    elif amount_sad >= 4:
+        diagnosis = "depressive"
+    elif amount_apathetic >= 6:
+        diagnosis = "schizoid"
+    return diagnosis
+
+
+class Tests:
+    @pytest.fixture(scope="function")
+    def diary(self, tmp_path):
+        path = tmp_path / "mood_diary.txt"
+        path.write_text("".join(f"2020-01-{day:02d}: {day % 5 - 2}\n" for day in range(1, 11)), encoding="utf-8")
+        return path
+
+    def test_same_labels_as_original_rules(self):
+        """
+        Does the rolling window give the same diagnosis as the original rules after every push?
+        """
+        rng = random.Random(0)
+        scores = [rng.choice([2, 2, 1, 0, 0, 0, -1, -1, -2]) for _ in range(5000)]
+        window = RollingMoodWindow()
+        for i, score in enumerate(scores):
+            window.push(score)
+            if i < 6:
+                assert window.diagnosis is None
+            else:
+                assert window.scores() == scores[i - 6 : i + 1]
+                assert window.diagnosis == original_diagnosis(scores[i - 6 : i + 1])
+
+    def test_resume_from_checkpoint(self, diary):
+        """
+        Is a checkpoint reused while the diary is unchanged, and ignored once the diary changes?
+        :param diary: the pytest fixture with a diary file, defined in this class.
+        """
+        window = resume(diary)
+        assert window.scores() == [day % 5 - 2 for day in range(4, 11)]
+
+        # a checkpoint with different contents proves that it, not the diary, was read
+        RollingMoodWindow(7, [2] * 7).save(checkpoint_path(diary), diary)
+        assert resume(diary).diagnosis == "manic"
+
+        with open(diary, "a", encoding="utf-8") as f:
+            f.write("2020-01-11: -1\n")
+        assert resume(diary).scores() == [day % 5 - 2 for day in range(5, 11)] + [-1]